@@ -0,0 +1,51 @@
+"""Shared image decoding for the pipeline agents."""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+# Inputs are local files we chose to process, and the anomaly suite
+# deliberately feeds a 10 000 × 10 000 image to test resolution handling --
+# not Pillow's decompression-bomb check, which would warn (or, past 2× the
+# limit, raise) and mark that case as errored.
+Image.MAX_IMAGE_PIXELS = None
+
+# Images above this many pixels (~48 MB as RGB) are decoded on every call
+# rather than cached, so one huge input cannot pin hundreds of MB for the
+# rest of the process.
+_CACHE_MAX_PIXELS = 1 << 24
+
+
+def _to_rgb(img: Image.Image) -> np.ndarray:
+    """Convert an opened image to a read-only uint8 RGB array."""
+    arr = np.asarray(img.convert("RGB"), dtype=np.uint8)
+    arr.flags.writeable = False  # shared between callers
+    return arr
+
+
+# A run reads one file at a time (the input, then each enhanced version),
+# so two entries cover the reuse without holding stale decodes
+@lru_cache(maxsize=2)
+def _decode_rgb(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """Decode *path* to a read-only uint8 RGB array (cached per file version)."""
+    with Image.open(path) as img:
+        return _to_rgb(img)
+
+
+def load_rgb(path: str) -> np.ndarray:
+    """Return the decoded RGB pixels of *path*.
+
+    The quality check, enhancement and video steps all read the same files,
+    so decodes are memoised on ``(path, mtime, size)``; rewriting a file
+    changes its key, which keeps stale pixels from being served.  Images
+    over ``_CACHE_MAX_PIXELS`` are decoded without caching.
+    """
+    st = os.stat(path)
+    with Image.open(path) as img:  # reads only the header
+        if img.width * img.height > _CACHE_MAX_PIXELS:
+            return _to_rgb(img)
+    return _decode_rgb(path, st.st_mtime_ns, st.st_size)
@@ -0,0 +1,125 @@
+"""Vectorised image kernels shared by the pipeline agents."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _moments_variance(total: int, sum_x: int, sum_x2: int) -> float:
+    """Population variance from exact integer moments."""
+    if total == 0:
+        return 0.0
+    return (total * sum_x2 - sum_x * sum_x) / (total * total)
+
+
+def edge_variance(gray: np.ndarray) -> float:
+    """Return the variance of Pillow's FIND_EDGES response for a uint8 image.
+
+    Reproduces ``ImageFilter.FIND_EDGES`` exactly -- the 3x3 kernel
+    ``8*centre - neighbours`` clipped to [0, 255], with the one-pixel border
+    copied unchanged from the source (images smaller than 3x3 are returned
+    as-is) -- but never materialises the filtered image as float64.  The
+    variance is accumulated from integer sum / sum-of-squares, which is exact
+    for uint8 data and therefore needs no Welford-style compensation.
+    """
+    h, w = gray.shape
+    if h < 3 or w < 3:
+        flat = gray.astype(np.int64).ravel()
+        return _moments_variance(flat.size, int(flat.sum()), int((flat * flat).sum()))
+
+    g = gray.astype(np.int16)
+
+    # 3x3 box sum of the interior; 9 * 255 fits comfortably in int16
+    box = g[:-2, :-2].copy()
+    for dy in range(3):
+        for dx in range(3):
+            if dy or dx:
+                box += g[dy : h - 2 + dy, dx : w - 2 + dx]
+
+    edges = g[1:-1, 1:-1] * 9
+    edges -= box
+    np.clip(edges, 0, 255, out=edges)
+
+    # Border pixels pass through unfiltered
+    border = np.concatenate((gray[0], gray[-1], gray[1:-1, 0], gray[1:-1, -1])).astype(np.int64)
+
+    total = edges.size + border.size
+    sum_x = int(edges.sum(dtype=np.int64)) + int(border.sum())
+    sum_x2 = int(np.einsum("ij,ij->", edges, edges, dtype=np.int64)) + int((border * border).sum())
+    return float(_moments_variance(total, sum_x, sum_x2))
+
+
+_BINS = np.arange(256, dtype=np.int64)
+
+
+def image_stats(gray: np.ndarray) -> tuple[float, float, float]:
+    """Return ``(mean, std, edge_variance)`` of a uint8 grayscale image.
+
+    The intensity moments come from a single 256-bin ``bincount`` pass and
+    the edge variance from :func:`edge_variance`; all three are accumulated
+    as exact integer moments, so the quality check needs just this one call.
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.int64)
+    total = int(hist.sum())
+    sum_x = int(hist @ _BINS)
+    sum_x2 = int(hist @ (_BINS * _BINS))
+    mean = sum_x / total if total else 0.0
+    std = _moments_variance(total, sum_x, sum_x2) ** 0.5
+    return float(mean), float(std), edge_variance(gray)
+
+
+# Float luma weights (ITU-R 601), as used by ImageEnhance.Color's grey image
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Rows are processed in bands of roughly this many pixels so the float32
+# working set stays small even for 10 000 x 10 000 inputs.
+_BAND_PIXELS = 1 << 22
+
+
+def tone_adjust(
+    rgb: np.ndarray,
+    brightness: float,
+    contrast: float,
+    saturation: float,
+    mean: float,
+) -> np.ndarray:
+    """Apply brightness, contrast and saturation to a uint8 RGB buffer in one pass.
+
+    Approximates chaining ``ImageEnhance.Brightness``, ``Contrast`` and
+    ``Color`` (in that order).  Because luma is linear, the three blends
+    collapse into a single affine map per pixel::
+
+        out = brightness * contrast * (saturation * rgb + (1 - saturation) * luma)
+              + (1 - contrast) * mean
+
+    ``mean`` stands in for the grayscale mean after the brightness step,
+    the grey reference ``ImageEnhance.Contrast`` blends against.  The
+    result can drift a few LSB (2-3 observed) from the Pillow chain:
+
+    * clipping to 0..255 happens once at the end, not after every step;
+    * callers pass ``mean`` as the unclipped ``raw_mean * brightness``,
+      and for large images ``raw_mean`` comes from a downsampled probe;
+    * there are no intermediate uint8 round-trips.
+
+    The enhancement agent also applies Sharpness after this pass rather
+    than before Color, as the original chain did.
+    """
+    h, w = rgb.shape[:2]
+    gain = np.float32(brightness * contrast)
+    offset = np.float32((1.0 - contrast) * mean)
+    sat = np.float32(saturation)
+
+    out = np.empty_like(rgb)
+    step = max(1, _BAND_PIXELS // max(w, 1))
+    for y0 in range(0, h, step):
+        band = rgb[y0 : y0 + step]
+        x = band.astype(np.float32)
+        luma = x @ _LUMA
+        luma *= 1 - sat
+        x *= sat
+        x += luma[..., None]
+        x *= gain
+        x += offset
+        np.clip(x, 0, 255, out=x)
+        out[y0 : y0 + step] = x  # truncates, like ImageEnhance's blend
+    return out
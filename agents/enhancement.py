@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import os
+
+import numpy as np
 from PIL import Image, ImageEnhance
 
+from agents._imageio import load_rgb
+from agents._kernels import tone_adjust
 from graph.state import ImagePipelineState
 
 # ── Enhancement factors ─────────────────────────────────────────────
@@ -13,6 +17,17 @@ from graph.state import ImagePipelineState
 # yields a factor of 1.0 + 0.4 * 0.5 = 1.20  (moderate boost).
 BOOST_STEP = 0.4
 
+# Small unconditional saturation boost applied every iteration
+COLOR_BOOST = 1.05
+
+# Factors closer to 1.0 than this are visually a no-op; skipping them saves
+# a full pass over the image.
+MIN_FACTOR_DELTA = 0.02
+
+
+def _is_noop(factor: float) -> bool:
+    return abs(factor - 1.0) < MIN_FACTOR_DELTA
+
 
 def _output_path(original_path: str, iteration: int) -> str:
     """Generate an output path for the enhanced image."""
@@ -30,53 +45,91 @@ def enhancement_agent(state: ImagePipelineState) -> dict:
     quality_scores = state["quality_scores"]
     iteration = state.get("enhancement_iteration", 0) + 1
 
-    img = Image.open(image_path)
+    rgb = state.get("image_buffer")
+    if rgb is None:
+        rgb = load_rgb(image_path)
     applied: list[str] = []
+    skipped: list[str] = []
 
     # ── Brightness ──────────────────────────────────────────────────
+    brightness = 1.0
     b_score = quality_scores["brightness"]["score"]
     if b_score < 1.0:
-        factor = 1.0 + BOOST_STEP * (1.0 - b_score)
+        brightness = 1.0 + BOOST_STEP * (1.0 - b_score)
         # If the raw brightness is too high, we need to *reduce* it
         if quality_scores["brightness"]["raw"] > 180:
-            factor = 1.0 / factor  # invert
-        img = ImageEnhance.Brightness(img).enhance(factor)
-        applied.append(f"Brightness x{factor:.2f}")
+            brightness = 1.0 / brightness  # invert
+        if _is_noop(brightness):
+            skipped.append(f"Brightness x{brightness:.3f}")
+            brightness = 1.0
+        else:
+            applied.append(f"Brightness x{brightness:.2f}")
 
     # ── Contrast ────────────────────────────────────────────────────
+    contrast = 1.0
     c_score = quality_scores["contrast"]["score"]
     if c_score < 1.0:
-        factor = 1.0 + BOOST_STEP * (1.0 - c_score)
-        img = ImageEnhance.Contrast(img).enhance(factor)
-        applied.append(f"Contrast x{factor:.2f}")
+        contrast = 1.0 + BOOST_STEP * (1.0 - c_score)
+        if _is_noop(contrast):
+            skipped.append(f"Contrast x{contrast:.3f}")
+            contrast = 1.0
+        else:
+            applied.append(f"Contrast x{contrast:.2f}")
+
+    # ── Color saturation (small general boost) ──────────────────────
+    saturation = COLOR_BOOST
+    if _is_noop(saturation):
+        skipped.append(f"Color x{saturation:.3f}")
+        saturation = 1.0
+    else:
+        applied.append(f"Color x{saturation:.2f}")
+
+    # Brightness, contrast and colour are fused into one NumPy pass; the
+    # contrast pivot is the grayscale mean after the brightness step, which
+    # the quality check has already measured.
+    if not (brightness == contrast == saturation == 1.0):
+        mean = quality_scores["brightness"]["raw"] * brightness
+        rgb = tone_adjust(rgb, brightness, contrast, saturation, mean)
+    img = Image.fromarray(rgb)
 
     # ── Sharpness ───────────────────────────────────────────────────
+    # Sharpness blends against a blurred copy, so it stays a Pillow call.
     s_score = quality_scores["sharpness"]["score"]
     if s_score < 1.0:
         factor = 1.0 + BOOST_STEP * (1.0 - s_score)
-        img = ImageEnhance.Sharpness(img).enhance(factor)
-        applied.append(f"Sharpness x{factor:.2f}")
-
-    # ── Color saturation (small general boost) ──────────────────────
-    img = ImageEnhance.Color(img).enhance(1.05)
-    applied.append("Color x1.05")
+        if _is_noop(factor):
+            skipped.append(f"Sharpness x{factor:.3f}")
+        else:
+            img = ImageEnhance.Sharpness(img).enhance(factor)
+            rgb = np.asarray(img)
+            applied.append(f"Sharpness x{factor:.2f}")
 
     # Save enhanced image
     out_path = _output_path(state["original_image_path"], iteration)
-    img.save(out_path)
+    # Single-pass baseline JPEG; the options are ignored for other formats
+    img.save(out_path, quality=85, optimize=False, progressive=False)
 
     enhancement_log = list(state.get("enhancement_log", []))
-    enhancement_log.append({"iteration": iteration, "applied": applied, "output": out_path})
+    enhancement_log.append(
+        {"iteration": iteration, "applied": applied, "skipped": skipped, "output": out_path}
+    )
 
     print(f"\n🔧 [Iteration {iteration}] Enhancement Applied:")
     for a in applied:
         print(f"   • {a}")
+    for a in skipped:
+        print(f"   ◦ {a} (skipped, ~no-op)")
     print(f"   Saved to: {out_path}")
 
+    status = f"Enhanced image (iteration {iteration}): {', '.join(applied)}"
+    if skipped:
+        status += f"; skipped no-op: {', '.join(skipped)}"
+
     return {
         "image_path": out_path,
+        "image_buffer": rgb,  # already matches img; no PIL -> ndarray round-trip
         "enhancement_iteration": iteration,
         "enhancement_log": enhancement_log,
-        "status": f"Enhanced image (iteration {iteration}): {', '.join(applied)}",
+        "status": status,
     }
 
@@ -1,13 +1,14 @@
-"""Video Generation Agent -- uses MoviePy to create a short video from the enhanced image."""
+"""Video Generation Agent -- streams a zoom animation of the enhanced image to ffmpeg."""
 
 from __future__ import annotations
 
 import os
 
+import cv2
+import imageio_ffmpeg
 import numpy as np
-from moviepy import ImageClip
-from PIL import Image
 
+from agents._imageio import load_rgb
 from graph.state import ImagePipelineState
 
 # ── Video settings ──────────────────────────────────────────────────
@@ -15,42 +16,62 @@ VIDEO_DURATION = 5  # seconds
 VIDEO_FPS = 24
 ZOOM_START = 1.0
 ZOOM_END = 1.2  # subtle Ken-Burns zoom
+# Per-frame upscale is at most ZOOM_END (sub-pixel steps between frames),
+# where bilinear is visually indistinguishable from Lanczos.
+ZOOM_INTERPOLATION = cv2.INTER_LINEAR
 
 
-def _make_zoom_clip(image_path: str, duration: float, fps: int) -> ImageClip:
-    """Create a clip with a slow Ken-Burns zoom effect.
+def _write_zoom_video(img_array: np.ndarray, video_path: str, duration: float, fps: int) -> None:
+    """Render a slow Ken-Burns zoom of a still RGB image straight to an H.264 file.
 
-    Uses MoviePy 2.x API: ImageClip(..., duration=...) and
-    .transform() for per-frame manipulation.
+    Every frame is a single affine warp (scale about the image centre) of
+    the source; frames are piped to ffmpeg through imageio-ffmpeg as they
+    are produced.
     """
-    img = Image.open(image_path).convert("RGB")
-    img_array = np.array(img)
     h, w = img_array.shape[:2]
 
-    base_clip = ImageClip(img_array, duration=duration).with_fps(fps)
-
-    def zoom_effect(get_frame, t):
-        """Apply a smooth zoom that scales from ZOOM_START to ZOOM_END."""
-        progress = t / duration
-        scale = ZOOM_START + (ZOOM_END - ZOOM_START) * progress
-
-        # Calculate crop box centred on the image
-        new_w = int(w / scale)
-        new_h = int(h / scale)
-        x1 = (w - new_w) // 2
-        y1 = (h - new_h) // 2
-
-        frame = get_frame(t)
-        cropped = frame[y1 : y1 + new_h, x1 : x1 + new_w]
-
-        # Resize back to original dimensions
-        resized = np.array(
-            Image.fromarray(cropped).resize((w, h), Image.LANCZOS)
-        )
-        return resized
-
-    zoomed = base_clip.transform(zoom_effect)
-    return zoomed
+    # Precompute one 2x3 zoom matrix per frame: dst = scale * (src - c) + c
+    frames_n = max(int(round(duration * fps)), 1)
+    scales = ZOOM_START + (ZOOM_END - ZOOM_START) * np.arange(frames_n) / frames_n
+    cx, cy = (w - 1) / 2, (h - 1) / 2
+    matrices = np.zeros((frames_n, 2, 3), dtype=np.float32)
+    matrices[:, 0, 0] = scales
+    matrices[:, 1, 1] = scales
+    matrices[:, 0, 2] = (1 - scales) * cx
+    matrices[:, 1, 2] = (1 - scales) * cy
+
+    # yuv420p needs even dimensions; fall back to 4:4:4 instead of letting
+    # ffmpeg rescale odd-sized inputs
+    even = w % 2 == 0 and h % 2 == 0
+    writer = imageio_ffmpeg.write_frames(
+        video_path,
+        (w, h),
+        fps=fps,
+        codec="libx264",
+        pix_fmt_in="rgb24",
+        pix_fmt_out="yuv420p" if even else "yuv444p",
+        quality=None,  # x264 default CRF
+        macro_block_size=1,
+    )
+    writer.send(None)  # prime the generator
+
+    # One output buffer for every frame: send() writes the bytes to ffmpeg's
+    # stdin before returning, so the buffer is free to reuse immediately.
+    frame = np.empty((h, w, 3), dtype=np.uint8)
+    try:
+        for matrix in matrices:
+            # Crop + resize collapsed into one OpenCV pass over the source
+            cv2.warpAffine(
+                img_array,
+                matrix,
+                (w, h),
+                dst=frame,
+                flags=ZOOM_INTERPOLATION,
+                borderMode=cv2.BORDER_REPLICATE,
+            )
+            writer.send(frame)
+    finally:
+        writer.close()
 
 
 def video_generation_agent(state: ImagePipelineState) -> dict:
@@ -61,24 +82,23 @@ def video_generation_agent(state: ImagePipelineState) -> dict:
     project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     out_dir = os.path.join(project_dir, "output")
     os.makedirs(out_dir, exist_ok=True)
-    video_path = os.path.join(out_dir, "final_video.mp4")
+    # One file per input so concurrent pipelines don't write the same path
+    basename = os.path.splitext(os.path.basename(state["original_image_path"]))[0]
+    video_path = os.path.join(out_dir, f"{basename}_final_video.mp4")
 
     print(f"\n🎬 Generating video from: {image_path}")
     print(f"   Duration : {VIDEO_DURATION}s @ {VIDEO_FPS}fps")
     print(f"   Zoom     : {ZOOM_START}x → {ZOOM_END}x")
 
-    clip = _make_zoom_clip(image_path, VIDEO_DURATION, VIDEO_FPS)
-    clip.write_videofile(
-        video_path,
-        fps=VIDEO_FPS,
-        codec="libx264",
-        audio=False,
-        logger="bar",
-    )
+    img_array = state.get("image_buffer")
+    if img_array is None:
+        img_array = load_rgb(image_path)
+    _write_zoom_video(img_array, video_path, VIDEO_DURATION, VIDEO_FPS)
 
     print(f"   ✅ Video saved to: {video_path}")
 
     return {
+        "image_buffer": None,  # last consumer; don't keep the pixels alive in final state
         "video_output_path": video_path,
         "status": f"Video generated at {video_path}",
     }
@@ -19,22 +19,35 @@ Test cases:
   9. rgba_with_alpha     – 4-channel RGBA PNG (alpha mismatch)
   10. normal_control     – a well-formed image (should succeed)
 
+Cases run concurrently on a thread pool (half the CPU cores by default).
+
 Usage:
     python anomaly_test.py [--defer-upload]
 """
 
 from __future__ import annotations
 
+import logging
 import os
 import random
 import shutil
 import struct
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
 from dotenv import load_dotenv
 from PIL import Image, ImageDraw
 
+# Optional: libvips can write the huge test image by streaming a replicated
+# tile instead of holding the whole 10 000 × 10 000 canvas in memory.
+try:
+    import pyvips
+    _PYVIPS_AVAILABLE = True
+except (ImportError, OSError):
+    _PYVIPS_AVAILABLE = False
+
 # ---------------------------------------------------------------------------
 # Test-image generators
 # ---------------------------------------------------------------------------
@@ -46,6 +59,15 @@ def _path(name: str) -> str:
     return os.path.join(TMP_DIR, name)
 
 
+def _probe(path: str) -> tuple[bool, int]:
+    """Return (exists, size_in_bytes) with a single stat() call."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False, 0
+    return True, st.st_size
+
+
 def gen_missing_file() -> tuple[str, str]:
     """Return a path to a file that does not exist."""
     p = _path("this_file_does_not_exist.jpg")
@@ -102,6 +124,16 @@ def gen_tiny_1x1() -> tuple[str, str]:
 def gen_huge_dimension() -> tuple[str, str]:
     """Create a very large image (10 000 × 10 000)."""
     p = _path("huge_10k.jpg")
+    if _PYVIPS_AVAILABLE:
+        # Draw one 1000 × 1000 tile and let libvips stream a 10 × 10
+        # replication of it to disk (~3 MB resident instead of ~300 MB)
+        tile = Image.new("RGB", (1_000, 1_000), color=(100, 150, 200))
+        draw = ImageDraw.Draw(tile)
+        draw.rectangle([100, 100, 900, 900], fill=(50, 80, 120))
+        vips_tile = pyvips.Image.new_from_array(np.asarray(tile), interpretation="srgb")
+        vips_tile.replicate(10, 10).jpegsave(p, Q=30)
+        return p, "huge_10000x10000"
+
     # Use a solid color to keep file size manageable
     img = Image.new("RGB", (10_000, 10_000), color=(100, 150, 200))
     draw = ImageDraw.Draw(img)
@@ -175,60 +207,84 @@ def _make_state(image_path: str, max_iter: int = 3) -> dict:
     }
 
 
-def run_anomaly_suite(*, defer_upload: bool = False) -> list[dict]:
-    """Run every anomaly test case and collect results."""
-    from graph.workflow import run_pipeline, flush_galileo
+def _run_one(index: int, label: str, image_path: str) -> dict:
+    """Run a single test case through the pipeline and return its result row."""
+    from graph.workflow import run_pipeline
+
+    state = _make_state(image_path)
+    t0 = time.perf_counter()
+
+    try:
+        final = run_pipeline(
+            state,
+            defer_upload=True,   # batch upload at the end
+            raise_on_error=False,  # don't crash the test suite
+        )
+        elapsed = time.perf_counter() - t0
+        errored = "PIPELINE_ERROR" in final.get("status", "")
+        tag = "❌ ERRORED" if errored else "✅ OK"
+        print(f"\n  [{index}] {label} → {tag}  ({elapsed:.2f}s)")
+        print(f"  Status: {final.get('status', '')[:120]}")
+        return {
+            "index": index,
+            "label": label,
+            "elapsed": elapsed,
+            "errored": errored,
+            "status": final.get("status", ""),
+            "quality_passed": final.get("quality_passed", False),
+        }
+
+    except Exception as exc:
+        # Shouldn't normally reach here since raise_on_error=False
+        elapsed = time.perf_counter() - t0
+        print(f"\n  [{index}] {label} → 💥 UNCAUGHT EXCEPTION ({elapsed:.2f}s)")
+        print(f"  {type(exc).__name__}: {exc}")
+        return {
+            "index": index,
+            "label": label,
+            "elapsed": elapsed,
+            "errored": True,
+            "status": f"UNCAUGHT: {type(exc).__name__}: {exc}",
+            "quality_passed": False,
+        }
+
+
+def run_anomaly_suite(*, defer_upload: bool = False, workers: int | None = None) -> list[dict]:
+    """Run every anomaly test case concurrently and collect results.
+
+    Cases are independent, so they run on a thread pool.  Threads (not
+    processes) keep every workflow in this process, where the Galileo
+    uploader thread can pick it up; the heavy work is NumPy/Pillow/ffmpeg
+    and mostly runs outside the GIL.  Each pipeline also spawns an ffmpeg
+    encoder, hence half the cores by default.
+    """
+    from graph.workflow import flush_galileo
+
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 2) // 2)
 
     results: list[dict] = []
 
-    for i, gen_fn in enumerate(GENERATORS, 1):
-        image_path, label = gen_fn()
-
-        print(f"\n{'━' * 60}")
-        print(f"  [{i}/{len(GENERATORS)}] TEST: {label}")
-        print(f"  Image: {image_path}")
-        print(f"  Exists: {os.path.exists(image_path)}"
-              f"  Size: {os.path.getsize(image_path) if os.path.exists(image_path) else 'N/A'} bytes")
-        print(f"{'━' * 60}")
-
-        state = _make_state(image_path)
-        t0 = time.perf_counter()
-
-        try:
-            final = run_pipeline(
-                state,
-                defer_upload=True,   # batch upload at the end
-                raise_on_error=False,  # don't crash the test suite
-            )
-            elapsed = time.perf_counter() - t0
-            errored = "PIPELINE_ERROR" in final.get("status", "")
-            results.append({
-                "index": i,
-                "label": label,
-                "elapsed": elapsed,
-                "errored": errored,
-                "status": final.get("status", ""),
-                "quality_passed": final.get("quality_passed", False),
-            })
-            tag = "❌ ERRORED" if errored else "✅ OK"
-            print(f"\n  Result: {tag}  ({elapsed:.2f}s)")
-            print(f"  Status: {final.get('status', '')[:120]}")
-
-        except Exception as exc:
-            # Shouldn't normally reach here since raise_on_error=False
-            elapsed = time.perf_counter() - t0
-            results.append({
-                "index": i,
-                "label": label,
-                "elapsed": elapsed,
-                "errored": True,
-                "status": f"UNCAUGHT: {type(exc).__name__}: {exc}",
-                "quality_passed": False,
-            })
-            print(f"\n  Result: 💥 UNCAUGHT EXCEPTION ({elapsed:.2f}s)")
-            print(f"  {type(exc).__name__}: {exc}")
-
-    # Upload all workflows (successes and failures) in one batch
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for i, gen_fn in enumerate(GENERATORS, 1):
+            image_path, label = gen_fn()
+
+            print(f"\n{'━' * 60}")
+            print(f"  [{i}/{len(GENERATORS)}] TEST: {label}")
+            print(f"  Image: {image_path}")
+            exists, size = _probe(image_path)
+            print(f"  Exists: {exists}  Size: {size if exists else 'N/A'} bytes")
+            print(f"{'━' * 60}")
+
+            futures.append(pool.submit(_run_one, i, label, image_path))
+
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    results.sort(key=lambda r: r["index"])
+
+    # Wait for every workflow (successes and failures) to be uploaded
     print(f"\n{'═' * 60}")
     print(f"  Uploading {len(results)} test workflows to Galileo…")
     print(f"{'═' * 60}")
@@ -297,6 +353,11 @@ def print_report(results: list[dict]) -> None:
 def main() -> None:
     global TMP_DIR
     load_dotenv()
+    # Pipeline diagnostics go to stdout, in order with the agents' prints;
+    # the root logger stays at WARNING so library INFO lines stay hidden
+    pipeline_log = logging.getLogger("pipeline")
+    pipeline_log.addHandler(logging.StreamHandler(sys.stdout))
+    pipeline_log.propagate = False
 
     TMP_DIR = os.path.join(os.path.dirname(__file__) or ".", "anomaly_test_images")
     if os.path.exists(TMP_DIR):
@@ -8,8 +8,8 @@ Galileo upload behaviour.
 
 Three modes:
   1. sequential-per-run  – upload to Galileo after every single workflow
-  2. sequential-batch    – run all workflows, upload in one batch at the end
-  3. concurrent-batch    – run workflows in parallel threads, upload once
+  2. sequential-batch    – run all workflows; uploads run in the background
+  3. concurrent-batch    – run workflows in parallel threads; background uploads
 
 Usage:
     python bulk_run.py [--count 20] [--mode sequential-per-run]
@@ -18,16 +18,32 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import io
+import logging
+import logging.handlers
 import os
+import queue
 import random
-import shutil
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from dotenv import load_dotenv
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter
 
+# The pipeline (langgraph, cv2, galileo) is imported inside main() and the
+# run modes, never at module level: --unique-images workers re-import this
+# module under the spawn start method and only need the image helpers.
+
 # ---------------------------------------------------------------------------
 # Image generators – each produces a different quality profile so the
 # pipeline exercises different enhancement paths.
@@ -46,29 +62,97 @@ PALETTES = [
 SIZES = [(320, 240), (640, 480), (800, 600), (1024, 768), (480, 480)]
 
 
-def generate_test_image(path: str, index: int) -> str:
-    """Create a synthetic image with varied quality characteristics."""
-    palette = PALETTES[index % len(PALETTES)]
-    w, h = random.choice(SIZES)
-    bg, s1, s2, s3, txt = palette
-
-    img = Image.new("RGB", (w, h), color=bg)
-    draw = ImageDraw.Draw(img)
-
-    # Shapes
-    draw.rectangle([w * 0.05, h * 0.1, w * 0.35, h * 0.55], fill=s1)
-    draw.ellipse([w * 0.4, h * 0.15, w * 0.75, h * 0.65], fill=s2)
-    draw.polygon(
-        [(w * 0.5, h * 0.05), (w * 0.7, h * 0.45), (w * 0.3, h * 0.45)],
-        fill=s3,
+# Test fixtures favour encode speed over size.  Measured on 1024×768 with
+# this Pillow build, JPEG (~1.5 ms) beats PNG even at compress_level=1
+# (~12 ms), so the fixtures stay JPEG with the cheapest settings spelled out.
+_JPEG_OPTIONS = {"format": "JPEG", "quality": 70, "subsampling": 2, "optimize": False}
+
+
+def _triangle_mask(yy: np.ndarray, xx: np.ndarray, pts) -> np.ndarray:
+    """Boolean mask of the pixels inside the triangle *pts* ((x, y) each)."""
+    (x0, y0), (x1, y1), (x2, y2) = pts
+
+    def edge(ax, ay, bx, by):
+        return (bx - ax) * (yy - ay) - (by - ay) * (xx - ax)
+
+    d0, d1, d2 = edge(x0, y0, x1, y1), edge(x1, y1, x2, y2), edge(x2, y2, x0, y0)
+    return ((d0 >= 0) & (d1 >= 0) & (d2 >= 0)) | ((d0 <= 0) & (d1 <= 0) & (d2 <= 0))
+
+
+# Shape geometry for every (palette, size) pair, resolved to pixel units
+# once at import: (bg, s1, s2, s3, txt, rect, ellipse, triangle, text_xy, w, h)
+_PRECOMPUTED = [
+    (
+        *palette,
+        (int(h * 0.1), int(h * 0.55) + 1, int(w * 0.05), int(w * 0.35) + 1),
+        (w * 0.575, h * 0.4, w * 0.175, h * 0.25),
+        ((w * 0.5, h * 0.05), (w * 0.7, h * 0.45), (w * 0.3, h * 0.45)),
+        (int(w * 0.2), int(h * 0.8)),
+        w,
+        h,
     )
-    draw.text((w * 0.2, h * 0.8), f"Test Image #{index + 1}", fill=txt)
+    for palette, (w, h) in product(PALETTES, SIZES)
+]
+
+
+def _render(entry: tuple, label: str, blur: bool) -> Image.Image:
+    """Draw one synthetic image from a ``_PRECOMPUTED`` entry."""
+    bg, s1, s2, s3, txt, (r0, r1, c0, c1), (cx, cy, rx, ry), triangle, text_xy, w, h = entry
+
+    # Shapes are filled straight into a uint8 buffer with slices and masks
+    arr = np.full((h, w, 3), bg, dtype=np.uint8)
+    yy, xx = np.ogrid[:h, :w]
+
+    arr[r0:r1, c0:c1] = s1
+    arr[((xx - cx) / rx) ** 2 + ((yy - cy) / ry) ** 2 <= 1.0] = s2
+    arr[_triangle_mask(yy, xx, triangle)] = s3
+
+    # Text rendering has no array equivalent, so it stays a Pillow call
+    img = Image.fromarray(arr)
+    ImageDraw.Draw(img).text(text_xy, label, fill=txt)
 
     # Optionally blur to lower sharpness
-    if index % 3 == 0:
+    if blur:
         img = img.filter(ImageFilter.GaussianBlur(radius=2))
+    return img
+
+
+def generate_test_image(path: str, index: int) -> str:
+    """Create a synthetic image with varied quality characteristics."""
+    # Seed per call: forked pool workers would otherwise inherit one RNG
+    # state and all pick the same sizes
+    random.seed(os.getpid() ^ index)
+    entry = _PRECOMPUTED[(index % len(PALETTES)) * len(SIZES) + random.randrange(len(SIZES))]
+    img = _render(entry, f"Test Image #{index + 1}", blur=index % 3 == 0)
+    img.save(path, **_JPEG_OPTIONS)
+    return path
+
 
-    img.save(path)
+@lru_cache(maxsize=None)
+def _template_bytes(k: int) -> bytes:
+    """Encoded JPEG of ``_PRECOMPUTED[k]``, rendered on first use.
+
+    Templates are shared by many images, so they carry a neutral
+    "Template N" label rather than an image number.
+    """
+    # Same blur rule as generate_test_image (palette index ≡ image index mod 3)
+    blur = (k // len(SIZES)) % 3 == 0
+    buf = io.BytesIO()
+    _render(_PRECOMPUTED[k], f"Template {k + 1}", blur).save(buf, **_JPEG_OPTIONS)
+    return buf.getvalue()
+
+
+def copy_test_image(path: str, index: int) -> str:
+    """Write one of the pre-rendered templates to *path*.
+
+    The pipeline only needs varied quality profiles, not unique pixels, so
+    for large batches a copy of a template stands in for a fresh render.
+    The palette cycles with *index* as in ``generate_test_image``.
+    """
+    palette_idx = index % len(PALETTES)
+    size_idx = (index // len(PALETTES)) % len(SIZES)
+    with open(path, "wb") as f:
+        f.write(_template_bytes(palette_idx * len(SIZES) + size_idx))
     return path
 
 
@@ -96,7 +180,7 @@ def _make_initial_state(image_path: str, max_iter: int = 3) -> dict:
 
 def run_sequential_per_run(image_paths: list[str]) -> list[dict]:
     """Run each pipeline sequentially; upload to Galileo after every run."""
-    from graph.workflow import run_pipeline, reset_galileo
+    from graph.workflow import reset_galileo, run_pipeline  # late import after dotenv
 
     results = []
     for i, path in enumerate(image_paths, 1):
@@ -115,8 +199,8 @@ def run_sequential_per_run(image_paths: list[str]) -> list[dict]:
 
 
 def run_sequential_batch(image_paths: list[str]) -> list[dict]:
-    """Run all pipelines sequentially; upload everything in one Galileo batch."""
-    from graph.workflow import run_pipeline, flush_galileo
+    """Run all pipelines sequentially; Galileo uploads overlap with the runs."""
+    from graph.workflow import flush_galileo, run_pipeline  # late import after dotenv
 
     results = []
     for i, path in enumerate(image_paths, 1):
@@ -130,23 +214,48 @@ def run_sequential_batch(image_paths: list[str]) -> list[dict]:
         results.append({"index": i, "elapsed": elapsed, "state": final})
         print(f"  ⏱  Finished in {elapsed:.2f}s")
 
-    # Single bulk upload
+    # Wait for the background uploader to drain
     print(f"\n{'═' * 60}")
-    print(f"  Uploading {len(results)} workflows to Galileo in one batch…")
+    print(f"  Waiting for Galileo uploads of {len(results)} workflows…")
     print(f"{'═' * 60}")
     t0 = time.perf_counter()
     uploaded = flush_galileo()
     upload_time = time.perf_counter() - t0
-    print(f"  ⏱  Upload took {upload_time:.2f}s for {uploaded} workflow(s)")
+    print(f"  ⏱  Upload wait took {upload_time:.2f}s for {uploaded} workflow(s)")
     results.append({"_upload_time": upload_time, "_uploaded_count": uploaded})
     return results
 
 
-def run_concurrent_batch(image_paths: list[str], workers: int = 4) -> list[dict]:
-    """Run pipelines in parallel threads; upload everything once at the end."""
-    from graph.workflow import run_pipeline, flush_galileo
+def _start_pool(workers: int) -> ThreadPoolExecutor:
+    """Create the worker pool and spin all of its threads up front."""
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline")
+    # ThreadPoolExecutor starts threads lazily, and an idle worker would pick
+    # up a plain no-op before a new thread is spawned.  Each warm-up task
+    # blocks on a shared barrier, so all *workers* threads must be running
+    # at once -- keeping thread start-up out of the timed section.
+    barrier = threading.Barrier(workers)
+    for f in [pool.submit(barrier.wait) for _ in range(workers)]:
+        f.result()
+    return pool
+
+
+def run_concurrent_batch(
+    image_paths: list[str],
+    workers: int = 4,
+    *,
+    pool: ThreadPoolExecutor | None = None,
+) -> list[dict]:
+    """Run pipelines in parallel threads; Galileo uploads overlap with the runs.
+
+    Pass *pool* (sized to *workers*) to reuse an existing executor; the
+    caller owns its shutdown.  Otherwise a temporary pool is created.
+    """
+    from graph.workflow import flush_galileo, run_pipeline  # late import after dotenv
 
     results: list[dict] = []
+    own_pool = pool is None
+    if own_pool:
+        pool = _start_pool(workers)
 
     def _worker(idx: int, path: str) -> dict:
         t0 = time.perf_counter()
@@ -156,24 +265,36 @@ def run_concurrent_batch(image_paths: list[str], workers: int = 4) -> list[dict]
 
     print(f"\n  Launching {len(image_paths)} workflows across {workers} threads…\n")
 
-    with ThreadPoolExecutor(max_workers=workers) as pool:
-        futures = {
-            pool.submit(_worker, i + 1, p): i
-            for i, p in enumerate(image_paths)
-        }
-        for future in as_completed(futures):
-            res = future.result()
-            results.append(res)
-            print(f"  ✔ Workflow #{res['index']} done in {res['elapsed']:.2f}s")
-
-    # Single bulk upload
+    # Keep at most 2×workers pipelines queued or running, so a large
+    # --count never holds every future (and its state) at once
+    max_pending = 2 * workers
+    todo = iter(enumerate(image_paths, 1))
+    pending: set[Future] = set()
+    try:
+        while True:
+            for idx, path in todo:
+                pending.add(pool.submit(_worker, idx, path))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                res = future.result()
+                results.append(res)
+                print(f"  ✔ Workflow #{res['index']} done in {res['elapsed']:.2f}s")
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    # Wait for the background uploader to drain
     print(f"\n{'═' * 60}")
-    print(f"  Uploading {len(results)} workflows to Galileo in one batch…")
+    print(f"  Waiting for Galileo uploads of {len(results)} workflows…")
     print(f"{'═' * 60}")
     t0 = time.perf_counter()
     uploaded = flush_galileo()
     upload_time = time.perf_counter() - t0
-    print(f"  ⏱  Upload took {upload_time:.2f}s for {uploaded} workflow(s)")
+    print(f"  ⏱  Upload wait took {upload_time:.2f}s for {uploaded} workflow(s)")
     results.append({"_upload_time": upload_time, "_uploaded_count": uploaded})
     return results
 
@@ -189,85 +310,156 @@ MODES = {
 }
 
 
+def _remove_run_files(image_paths: list[str], pipeline_results: list[dict]) -> None:
+    """Delete the test images plus the enhanced images and videos made from them."""
+    paths = list(image_paths)
+    for r in pipeline_results:
+        state = r["state"]
+        paths.extend(entry["output"] for entry in state.get("enhancement_log", []))
+        if state.get("video_output_path"):
+            paths.append(state["video_output_path"])
+    for p in paths:
+        try:
+            os.unlink(p)
+        except FileNotFoundError:
+            pass
+
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Route log records through a queue to a single stdout writer thread.
+
+    Pipeline threads only enqueue records, so they never block on the
+    stdout lock while another worker is writing.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+
+    # Only the pipeline's own logger; the root logger stays at WARNING so
+    # library INFO lines (e.g. one per HTTP request) stay off the console
+    pipeline_log = logging.getLogger("pipeline")
+    pipeline_log.addHandler(logging.handlers.QueueHandler(log_queue))
+    pipeline_log.propagate = False
+    listener.start()
+    return listener
+
+
 def main() -> None:
-    load_dotenv()
-
-    parser = argparse.ArgumentParser(description="Bulk pipeline runner for Galileo scaling test.")
-    parser.add_argument("--count", type=int, default=20, help="Number of images to process (default 20).")
-    parser.add_argument(
-        "--mode",
-        choices=list(MODES.keys()),
-        default="sequential-batch",
-        help="Execution mode (default: sequential-batch).",
-    )
-    parser.add_argument("--workers", type=int, default=4, help="Thread count for concurrent-batch mode.")
-    args = parser.parse_args()
-
-    # Prepare temp directory for test images
-    tmp_dir = os.path.join(os.path.dirname(__file__) or ".", "bulk_test_images")
-    if os.path.exists(tmp_dir):
-        shutil.rmtree(tmp_dir)
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    print("=" * 60)
-    print("  Bulk Pipeline Runner – Galileo Scaling Test")
-    print("=" * 60)
-    print(f"  Mode           : {args.mode}")
-    print(f"  Image count    : {args.count}")
-    if args.mode == "concurrent-batch":
-        print(f"  Worker threads : {args.workers}")
-    print(f"  Temp dir       : {tmp_dir}")
-    print("=" * 60)
-
-    # Generate varied test images
-    print("\n📷 Generating test images…")
-    image_paths: list[str] = []
-    for i in range(args.count):
-        p = os.path.join(tmp_dir, f"test_{i + 1:03d}.jpg")
-        generate_test_image(p, i)
-        image_paths.append(p)
-    print(f"   Created {len(image_paths)} images.\n")
-
-    # Run
-    overall_start = time.perf_counter()
-
-    if args.mode == "concurrent-batch":
-        results = run_concurrent_batch(image_paths, workers=args.workers)
-    else:
-        runner = MODES[args.mode]
-        results = runner(image_paths)
-
-    overall_elapsed = time.perf_counter() - overall_start
-
-    # Summary
-    pipeline_results = [r for r in results if "index" in r]
-    times = [r["elapsed"] for r in pipeline_results]
-
-    print("\n" + "=" * 60)
-    print("  Bulk Run Summary")
-    print("=" * 60)
-    print(f"  Mode               : {args.mode}")
-    print(f"  Total workflows    : {len(pipeline_results)}")
-    print(f"  Total wall-clock   : {overall_elapsed:.2f}s")
-    if times:
-        print(f"  Avg per workflow   : {sum(times) / len(times):.2f}s")
-        print(f"  Min / Max          : {min(times):.2f}s / {max(times):.2f}s")
-        print(f"  Throughput         : {len(times) / overall_elapsed:.1f} workflows/s")
-
-    upload_rows = [r for r in results if "_upload_time" in r]
-    if upload_rows:
-        u = upload_rows[0]
-        print(f"  Galileo upload     : {u['_uploaded_count']} workflows in {u['_upload_time']:.2f}s")
-    print("=" * 60 + "\n")
-
-    # Cleanup enhanced + output dirs that the pipeline creates per image
-    for d in ["enhanced", "output"]:
-        full = os.path.join(os.path.dirname(__file__) or ".", d)
-        if os.path.isdir(full):
-            shutil.rmtree(full)
-    if os.path.isdir(tmp_dir):
-        shutil.rmtree(tmp_dir)
-    print("🧹 Cleaned up temporary files.\n")
+    log_listener = _start_log_listener()
+    try:
+        parser = argparse.ArgumentParser(description="Bulk pipeline runner for Galileo scaling test.")
+        parser.add_argument("--count", type=int, default=20, help="Number of images to process (default 20).")
+        parser.add_argument(
+            "--mode",
+            choices=list(MODES.keys()),
+            default="sequential-batch",
+            help="Execution mode (default: sequential-batch).",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Thread count for concurrent-batch mode.")
+        parser.add_argument(
+            "--unique-images",
+            action="store_true",
+            help="Render every test image separately instead of copying cached templates.",
+        )
+        args = parser.parse_args()
+
+        # graph.workflow reads its settings from the environment at import time
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        try:
+            import graph.workflow  # noqa: F401
+        except ImportError as exc:
+            sys.exit(f"❌ Could not import the pipeline ({exc}); run `pip install -r requirements.txt`.")
+
+        # Prepare temp directory for test images; files are overwritten by
+        # index, so an existing directory is reused as-is
+        tmp_dir = os.path.join(os.path.dirname(__file__) or ".", "bulk_test_images")
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        print("=" * 60)
+        print("  Bulk Pipeline Runner – Galileo Scaling Test")
+        print("=" * 60)
+        print(f"  Mode           : {args.mode}")
+        print(f"  Image count    : {args.count}")
+        if args.mode == "concurrent-batch":
+            print(f"  Worker threads : {args.workers}")
+        print(f"  Temp dir       : {tmp_dir}")
+        print("=" * 60)
+
+        # Generate varied test images
+        print("\n📷 Generating test images…")
+        image_paths = [os.path.join(tmp_dir, f"test_{i + 1:03d}.jpg") for i in range(args.count)]
+        if args.unique_images:
+            # Each image is independent, so encode them on all cores
+            with ProcessPoolExecutor() as pe:
+                list(pe.map(generate_test_image, image_paths, range(args.count), chunksize=8))
+        else:
+            for i, p in enumerate(image_paths):
+                copy_test_image(p, i)
+        # Drop leftovers from an earlier, larger run
+        expected = {os.path.basename(p) for p in image_paths}
+        with os.scandir(tmp_dir) as entries:
+            for e in entries:
+                if e.is_file() and e.name not in expected:
+                    os.unlink(e.path)
+        print(f"   Created {len(image_paths)} images.\n")
+
+        # One pool for the whole run, started before the clock
+        pool = _start_pool(args.workers) if args.mode == "concurrent-batch" else None
+
+        # Run
+        overall_start = time.perf_counter()
+
+        try:
+            if pool is not None:
+                results = run_concurrent_batch(image_paths, workers=args.workers, pool=pool)
+            else:
+                runner = MODES[args.mode]
+                results = runner(image_paths)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        overall_elapsed = time.perf_counter() - overall_start
+
+        # Summary
+        pipeline_results = [r for r in results if "index" in r]
+        times = [r["elapsed"] for r in pipeline_results]
+
+        print("\n" + "=" * 60)
+        print("  Bulk Run Summary")
+        print("=" * 60)
+        print(f"  Mode               : {args.mode}")
+        print(f"  Total workflows    : {len(pipeline_results)}")
+        print(f"  Total wall-clock   : {overall_elapsed:.2f}s")
+        if times:
+            print(f"  Avg per workflow   : {sum(times) / len(times):.2f}s")
+            print(f"  Min / Max          : {min(times):.2f}s / {max(times):.2f}s")
+            print(f"  Throughput         : {len(times) / overall_elapsed:.1f} workflows/s")
+
+        upload_rows = [r for r in results if "_upload_time" in r]
+        if upload_rows:
+            u = upload_rows[0]
+            print(f"  Galileo upload     : {u['_uploaded_count']} workflows in {u['_upload_time']:.2f}s")
+        print("=" * 60 + "\n")
+
+        # Cleanup: remove exactly the files this run wrote, then the
+        # directories if that left them empty
+        _remove_run_files(image_paths, pipeline_results)
+        for d in [
+            os.path.join(tmp_dir, "enhanced"),
+            tmp_dir,
+            os.path.join(os.path.dirname(__file__) or ".", "output"),
+        ]:
+            try:
+                os.rmdir(d)
+            except OSError:
+                pass  # missing, or holds files from another run
+        print("🧹 Cleaned up temporary files.\n")
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 from graph.state import ImagePipelineState
-from graph.workflow import build_workflow, run_pipeline, flush_galileo, reset_galileo
+from graph.workflow import arun_pipeline, build_workflow, run_pipeline, flush_galileo, reset_app, reset_galileo, run_pipeline_batch, shutdown_galileo
 
-__all__ = ["ImagePipelineState", "build_workflow", "run_pipeline", "flush_galileo", "reset_galileo"]
+__all__ = ["ImagePipelineState", "arun_pipeline", "build_workflow", "run_pipeline", "flush_galileo", "reset_app", "reset_galileo", "run_pipeline_batch", "shutdown_galileo"]
 
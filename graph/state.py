@@ -1,6 +1,6 @@
 """State definition for the image processing pipeline."""
 
-from typing import TypedDict
+from typing import Any, NotRequired, TypedDict
 
 
 class ImagePipelineState(TypedDict):
@@ -9,10 +9,12 @@ class ImagePipelineState(TypedDict):
     # Paths
     image_path: str  # Path to current (possibly enhanced) image
     original_image_path: str  # Path to the original input image
+    image_buffer: NotRequired[Any]  # Decoded uint8 RGB ndarray of image_path, if already in memory
 
     # Quality assessment
     quality_scores: dict  # {"brightness": float, "contrast": float, "sharpness": float, "overall": float}
     quality_passed: bool  # Whether quality thresholds are met
+    route: NotRequired[str]  # Next node chosen after the quality check ("enhance" / "generate_video")
 
     # Enhancement tracking
     enhancement_iteration: int  # Current iteration count
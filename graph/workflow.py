@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures.thread
 import json
+import logging
 import os
+import queue
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from langgraph.graph import END, StateGraph
 
@@ -26,53 +30,122 @@ try:
 except ImportError:
     _GALILEO_AVAILABLE = False
 
+# orjson is an optional, faster encoder for the full JSON payloads
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:
+    # One shared encoder: json.dumps(default=...) builds a new one per call
+    _dumps = json.JSONEncoder(default=str).encode
+
+# Diagnostics go through logging so callers choose where (and whether) they
+# are written; entry points attach a handler to the "pipeline" logger.
+log = logging.getLogger("pipeline")
+
+# PIPELINE_VERBOSE=0 drops the per-step and per-workflow progress lines
+# (warnings still go through) and skips building their arguments.  The level
+# is set here so entry points can leave the root logger at WARNING.
+_VERBOSE = os.getenv("PIPELINE_VERBOSE", "1") != "0"
+log.setLevel(logging.INFO if _VERBOSE else logging.WARNING)
+
 # Module-level holder shared across all nodes during a single run.
 _observe_workflows: Optional[Any] = None
 _galileo_init_done = False
-_galileo_lock = threading.Lock()  # serialise Galileo API access
+_galileo_init_lock = threading.Lock()  # serialises _init_galileo
+_galileo_lock = threading.Lock()  # guards the upload counter below
+
+# State keys included in the full JSON payloads sent to Galileo (the
+# enhancement log and the pixel buffer are deliberately left out)
+_SUMMARY_KEYS = (
+    "image_path",
+    "original_image_path",
+    "quality_scores",
+    "quality_passed",
+    "enhancement_iteration",
+    "max_iterations",
+    "video_output_path",
+    "status",
+)
+
+# Set GALILEO_FULL_PAYLOAD to log the whole state as JSON instead of the
+# compact one-line summary
+_FULL_PAYLOAD = bool(os.getenv("GALILEO_FULL_PAYLOAD"))
+_STATUS_LIMIT = 200  # max status characters in a compact summary
+
+# Without the SDK or an API key nothing collected could ever be uploaded,
+# so nodes run unwrapped, no summaries are built, and every Galileo helper
+# returns on this one check.  Read at import, like the flag above.
+_INSTRUMENTATION_ENABLED = _GALILEO_AVAILABLE and bool(os.getenv("GALILEO_API_KEY"))
+
+
+def _env_number(name: str, default: str, parse: Callable[[str], int]) -> int:
+    """Parse env var *name* with *parse*, falling back to *default* if unset or invalid."""
+    raw = os.getenv(name) or default
+    try:
+        return parse(raw)
+    except (ValueError, OverflowError):
+        log.warning("⚠️  Ignoring %s=%r (not a valid number); using %s.", name, raw, default)
+        return parse(default)
+
+
+# Step sampling: record the 1st, (K+1)th, ... call of each node per run when
+# GALILEO_SAMPLE_RATE=K.  Failed steps and steps slower than
+# GALILEO_SLOW_STEP_MS are always recorded.  Per-node call counts are
+# attached to every workflow, so sampled runs keep the full totals.
+_SAMPLE_RATE = max(1, _env_number("GALILEO_SAMPLE_RATE", "1", int))
+_SLOW_STEP_NS = _env_number("GALILEO_SLOW_STEP_MS", "500", lambda v: int(float(v) * 1_000_000))
 
 
 def _init_galileo() -> Optional[Any]:
     """Initialise the ObserveWorkflows tracker (singleton per process).
 
-    Returns the ObserveWorkflows instance or None if unavailable.
+    Returns the ObserveWorkflows instance or None if unavailable.  The done
+    flag is set only after the tracker is published, so a concurrent caller
+    waits on the lock instead of reading a half-initialised None.
     """
     global _observe_workflows, _galileo_init_done  # noqa: PLW0603
     if _galileo_init_done:
         return _observe_workflows
 
-    _galileo_init_done = True
+    with _galileo_init_lock:
+        if _galileo_init_done:
+            return _observe_workflows
+        try:
+            if not _GALILEO_AVAILABLE:
+                log.warning("⚠️  galileo-observe not installed – running without observability.")
+                return None
 
-    if not _GALILEO_AVAILABLE:
-        print("⚠️  galileo-observe not installed – running without observability.")
-        return None
+            api_key = os.getenv("GALILEO_API_KEY")
+            project = os.getenv("GALILEO_PROJECT", "TestGalileo")
 
-    api_key = os.getenv("GALILEO_API_KEY")
-    project = os.getenv("GALILEO_PROJECT", "TestGalileo")
+            if not api_key:
+                log.warning("⚠️  GALILEO_API_KEY not set – running without observability.")
+                return None
 
-    if not api_key:
-        print("⚠️  GALILEO_API_KEY not set – running without observability.")
-        return None
+            try:
+                _observe_workflows = ObserveWorkflows(project_name=project)
+                log.info("✅ Galileo Observe initialised (project=%r)", project)
+            except Exception as exc:
+                log.warning("⚠️  Failed to initialise Galileo Observe: %s\n   Continuing without observability.", exc)
+                return None
 
-    try:
-        _observe_workflows = ObserveWorkflows(project_name=project)
-        print(f"✅ Galileo Observe initialised (project={project!r})")
-    except Exception as exc:
-        print(f"⚠️  Failed to initialise Galileo Observe: {exc}")
-        print("   Continuing without observability.")
-        return None
-
-    return _observe_workflows
+            return _observe_workflows
+        finally:
+            _galileo_init_done = True
 
 
 # ── Thread-local step collector ─────────────────────────────────────
 # Each thread accumulates steps in its own buffer during pipeline
-# execution.  Once the pipeline finishes, the entire workflow
-# (start → steps → conclude) is replayed into the Galileo API under
-# a single lock – guaranteeing no interleaving between threads.
+# execution.  Once the pipeline finishes, the workflow is queued for the
+# uploader thread, the only thread that replays (start → steps →
+# conclude) into the Galileo API – guaranteeing no interleaving between
+# workflows.
 
 
-@dataclass
+# Slotted: one record per node call, so keep them small
+@dataclass(slots=True)
 class _StepRecord:
     node_name: str
     input_text: str
@@ -84,11 +157,22 @@ class _StepRecord:
 _thread_local = threading.local()
 
 
+def _get_node_calls() -> dict[str, int]:
+    """Return this thread's per-node call counts for the current run."""
+    try:
+        return _thread_local.node_calls
+    except AttributeError:
+        _thread_local.node_calls = calls = {}
+        return calls
+
+
 def _get_step_buffer() -> list[_StepRecord]:
     """Return the step buffer for the current thread (create if needed)."""
-    if not hasattr(_thread_local, "steps"):
-        _thread_local.steps = []
-    return _thread_local.steps
+    try:
+        return _thread_local.steps
+    except AttributeError:
+        _thread_local.steps = steps = []
+        return steps
 
 
 def _collect_step(
@@ -100,89 +184,194 @@ def _collect_step(
     status_code: int = 200,
 ) -> None:
     """Buffer a step record (thread-local, no lock needed)."""
+    if not _INSTRUMENTATION_ENABLED:
+        return
     buf = _get_step_buffer()
     buf.append(_StepRecord(node_name, input_text, output_text, duration_ns, status_code))
-    duration_ms = duration_ns / 1_000_000
-    tag = "ERROR" if status_code >= 400 else "OK"
-    print(f"  📝 [Collected] step: {node_name} ({duration_ms:.0f}ms) [{tag}]")
+    if _VERBOSE:
+        log.info(
+            "  📝 [Collected] step: %s (%.0fms) [%s]",
+            node_name, duration_ns / 1_000_000, "ERROR" if status_code >= 400 else "OK",
+        )
+
+
+@dataclass(slots=True)
+class _PendingWorkflow:
+    input_text: str
+    output_text: str
+    duration_ns: int
+    status_code: int
+    steps: list[_StepRecord]
+    node_calls: dict[str, int]
+
 
+# Finished workflows are handed to a background uploader thread, which
+# replays and uploads them while the pipelines keep running.  A ``None``
+# item tells the thread to exit.
+_UPLOAD_BATCH = 30  # max workflows per upload_workflows() request
+_upload_queue: queue.Queue[Optional[_PendingWorkflow]] = queue.Queue()
+_uploader_thread: Optional[threading.Thread] = None
+_uploader_lock = threading.Lock()
+_uploaded_since_flush = 0  # guarded by _galileo_lock
 
-def _replay_workflow_to_galileo(
+
+def _ensure_uploader() -> None:
+    """Start the background uploader thread if it is not running."""
+    global _uploader_thread  # noqa: PLW0603
+    if _uploader_thread is not None and _uploader_thread.is_alive():
+        return
+    with _uploader_lock:
+        if _uploader_thread is None or not _uploader_thread.is_alive():
+            _uploader_thread = threading.Thread(
+                target=_upload_loop, name="galileo-uploader", daemon=True
+            )
+            _uploader_thread.start()
+
+
+def _enqueue_workflow_for_replay(
     input_summary: str,
     output_summary: str,
     total_duration_ns: int,
     *,
     workflow_status_code: int = 200,
 ) -> None:
-    """Replay all collected steps as a single Galileo workflow (atomic).
+    """Queue this thread's collected steps as one finished workflow.
 
     Args:
         workflow_status_code: HTTP-style status for the overall workflow.
             200 = success, 500 = pipeline crashed.
     """
-    ow = _init_galileo()
-    if ow is None:
+    if not _INSTRUMENTATION_ENABLED:
         return
-
+    # The tracker is resolved by the uploader thread, so a workflow is never
+    # dropped while another thread is still initialising it
     steps = _get_step_buffer()
+    node_calls = _get_node_calls()
     has_errors = any(s.status_code >= 400 for s in steps)
     wf_code = workflow_status_code if workflow_status_code >= 400 else (500 if has_errors else 200)
+    _ensure_uploader()
+    _upload_queue.put(
+        _PendingWorkflow(
+            input_summary, output_summary, total_duration_ns, wf_code,
+            list(steps), dict(node_calls),
+        )
+    )
 
-    with _galileo_lock:
-        try:
-            # 1. Start workflow
-            ow.add_agent_workflow(
-                input=input_summary,
-                name="image-enhancement-pipeline",
+    # Clear the buffers for this thread
+    steps.clear()
+    node_calls.clear()
+
+
+def _replay_workflow(ow: Any, wf: _PendingWorkflow) -> None:
+    """Replay one queued workflow into *ow* (uploader thread only)."""
+    has_errors = any(s.status_code >= 400 for s in wf.steps)
+    try:
+        # 1. Start workflow
+        ow.add_agent_workflow(
+            input=wf.input_text,
+            name="image-enhancement-pipeline",
+            metadata={
+                "framework": "langgraph",
+                "has_errors": str(has_errors),
+                "workflow_status": str(wf.status_code),
+                "node_calls": ",".join(f"{k}={v}" for k, v in wf.node_calls.items()),
+            },
+        )
+        # 2. Replay every step (with per-step status codes)
+        for step in wf.steps:
+            ow.add_tool_step(
+                input=step.input_text,
+                output=step.output_text,
+                name=step.node_name,
+                duration_ns=step.duration_ns,
+                status_code=step.status_code,
                 metadata={
-                    "framework": "langgraph",
-                    "has_errors": str(has_errors),
-                    "workflow_status": str(wf_code),
+                    "node": step.node_name,
+                    "status": "error" if step.status_code >= 400 else "ok",
                 },
             )
-            # 2. Replay every step (with per-step status codes)
-            for step in steps:
-                ow.add_tool_step(
-                    input=step.input_text,
-                    output=step.output_text,
-                    name=step.node_name,
-                    duration_ns=step.duration_ns,
-                    status_code=step.status_code,
-                    metadata={
-                        "node": step.node_name,
-                        "status": "error" if step.status_code >= 400 else "ok",
-                    },
-                )
-            # 3. Conclude
-            ow.conclude_workflow(
-                output=output_summary,
-                duration_ns=total_duration_ns,
-                status_code=wf_code,
+        # 3. Conclude
+        ow.conclude_workflow(
+            output=wf.output_text,
+            duration_ns=wf.duration_ns,
+            status_code=wf.status_code,
+        )
+        if _VERBOSE:
+            log.info(
+                "  📤 [Galileo] Replayed workflow (%d steps, %.0fms) [%s]",
+                len(wf.steps), wf.duration_ns / 1_000_000,
+                "❌ ERROR" if wf.status_code >= 400 else "✅ OK",
             )
-            total_ms = total_duration_ns / 1_000_000
-            status_tag = "❌ ERROR" if wf_code >= 400 else "✅ OK"
-            print(f"  📤 [Galileo] Replayed workflow ({len(steps)} steps, {total_ms:.0f}ms) [{status_tag}]")
-        except Exception as exc:
-            print(f"  ⚠️  Galileo: failed to replay workflow – {exc}")
-
-    # Clear the buffer for this thread
-    steps.clear()
+    except Exception as exc:
+        log.warning("  ⚠️  Galileo: failed to replay workflow – %s", exc)
+
+
+def _upload_loop() -> None:
+    """Uploader thread body: replay and upload queued workflows in batches."""
+    global _uploaded_since_flush  # noqa: PLW0603
+    while True:
+        batch = [_upload_queue.get()]
+        # Take whatever else is already waiting, up to one batch
+        while len(batch) < _UPLOAD_BATCH:
+            try:
+                batch.append(_upload_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = None in batch
+        workflows = [wf for wf in batch if wf is not None]
+        try:
+            ow = _init_galileo()
+            if ow is not None and workflows:
+                # Only this thread calls into the tracker, so the replay
+                # needs no lock
+                for wf in workflows:
+                    _replay_workflow(ow, wf)
+                try:
+                    log.info("📤 [Galileo] Uploading workflows to Galileo...")
+                    results = ow.upload_workflows()
+                    log.info("✅ Galileo: uploaded %d workflow(s) successfully.", len(results))
+                    with _galileo_lock:
+                        _uploaded_since_flush += len(results)
+                except Exception as exc:
+                    log.warning("⚠️  Galileo: failed to upload workflows – %s", exc)
+        finally:
+            for _ in batch:
+                _upload_queue.task_done()
+        if stop:
+            return
 
 
 def flush_galileo() -> int:
-    """Upload all accumulated workflows to Galileo. Returns count uploaded."""
-    ow = _init_galileo()
-    if ow is None:
+    """Wait until every queued workflow has been uploaded.
+
+    Returns the number of workflows uploaded since the previous flush.
+    """
+    global _uploaded_since_flush  # noqa: PLW0603
+    if not _INSTRUMENTATION_ENABLED:
         return 0
+    if _uploader_thread is not None and _uploader_thread.is_alive():
+        _upload_queue.join()
     with _galileo_lock:
-        try:
-            print(f"📤 [Galileo] Uploading workflows to Galileo...")
-            results = ow.upload_workflows()
-            print(f"✅ Galileo: uploaded {len(results)} workflow(s) successfully.")
-            return len(results)
-        except Exception as exc:
-            print(f"⚠️  Galileo: failed to upload workflows – {exc}")
-            return 0
+        uploaded, _uploaded_since_flush = _uploaded_since_flush, 0
+    return uploaded
+
+
+def shutdown_galileo() -> None:
+    """Upload anything still queued and stop the uploader thread."""
+    thread = _uploader_thread
+    if thread is None or not thread.is_alive():
+        return
+    _upload_queue.put(None)
+    thread.join()
+
+
+# Daemon threads are killed at interpreter exit, so drain the queue first.
+# A plain atexit hook runs after concurrent.futures has shut down, and the
+# SDK's async upload needs an executor for DNS lookups.  Threading atexit
+# hooks run in reverse order, so registering after the executor module
+# (imported above) makes this drain run before executor shutdown.
+threading._register_atexit(shutdown_galileo)
 
 
 def reset_galileo() -> None:
@@ -194,32 +383,74 @@ def reset_galileo() -> None:
 
 # ── Galileo-instrumented wrapper helpers ────────────────────────────
 
+def _clip(text: str, limit: int) -> str:
+    """Return *text* cut to *limit* characters, marked with "…" if cut."""
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _summarize(state: dict) -> str:
+    """Return the string logged to Galileo for a state (or node result).
+
+    Galileo only needs enough to tell steps apart, so by default this is a
+    short ``key=value`` line of the fields present rather than a JSON dump.
+    """
+    if _FULL_PAYLOAD:
+        return _dumps({k: state[k] for k in _SUMMARY_KEYS if k in state})
+
+    parts = []
+    if "image_path" in state:
+        parts.append(f"image_path={state['image_path']}")
+    if "enhancement_iteration" in state:
+        parts.append(f"iter={state['enhancement_iteration']}")
+    if "quality_scores" in state and "overall" in state["quality_scores"]:
+        parts.append(f"overall={state['quality_scores']['overall']}")
+    if "quality_passed" in state:
+        parts.append(f"passed={state['quality_passed']}")
+    if "enhancement_log" in state:
+        parts.append(f"log_len={len(state['enhancement_log'])}")
+    if "status" in state:
+        # Status may embed an exception message; clip it before formatting
+        parts.append(f"status={_clip(str(state['status']), _STATUS_LIMIT)}")
+    return " ".join(parts)
+
+
 def _observed(node_name: str, fn):
     """Wrap a LangGraph node function with step collection."""
+    if not _INSTRUMENTATION_ENABLED:
+        return fn
+
+    # Bind the helpers once as closure cells: wrapper runs on every graph
+    # step.  Not default arguments -- LangGraph inspects node signatures.
+    ns = time.perf_counter_ns
+    summarize = _summarize
+    collect = _collect_step
+    get_calls = _get_node_calls
+    rate = _SAMPLE_RATE
+    slow_ns = _SLOW_STEP_NS
 
     def wrapper(state: ImagePipelineState) -> dict:
-        input_summary = json.dumps(
-            {k: v for k, v in state.items() if k != "enhancement_log"},
-            default=str,
-        )
+        calls = get_calls()
+        n = calls.get(node_name, 0)
+        calls[node_name] = n + 1
 
-        start_ns = time.time_ns()
+        start_ns = ns()
         try:
             result = fn(state)
         except Exception as exc:
-            duration_ns = time.time_ns() - start_ns
-            _collect_step(
+            collect(
                 node_name,
-                input_summary,
+                summarize(state),
                 f"ERROR: {type(exc).__name__}: {exc}",
-                duration_ns,
+                ns() - start_ns,
                 status_code=500,
             )
             raise
 
-        duration_ns = time.time_ns() - start_ns
-        output_summary = json.dumps(result, default=str)
-        _collect_step(node_name, input_summary, output_summary, duration_ns)
+        duration_ns = ns() - start_ns
+        # Nodes return a new dict and leave *state* untouched, so both
+        # summaries can wait until the step is known to be kept
+        if n % rate == 0 or duration_ns >= slow_ns:
+            collect(node_name, summarize(state), summarize(result), duration_ns)
         return result
 
     wrapper.__name__ = node_name
@@ -228,9 +459,9 @@ def _observed(node_name: str, fn):
 
 # ── Routing logic ───────────────────────────────────────────────────
 
-def _should_continue(state: ImagePipelineState) -> str:
-    """Conditional edge: decide whether to enhance again or generate video."""
-    if state.get("quality_passed", False):
+def _route_after_quality_check(state: ImagePipelineState, result: dict) -> str:
+    """Decide whether to enhance again or generate video."""
+    if result.get("quality_passed", False):
         return "generate_video"
     if state.get("enhancement_iteration", 0) >= state.get("max_iterations", 5):
         print("\n⚠️  Max enhancement iterations reached – proceeding to video generation.")
@@ -238,6 +469,27 @@ def _should_continue(state: ImagePipelineState) -> str:
     return "enhance"
 
 
+def _with_route(fn):
+    """Wrap the quality-check node so its result carries the next route."""
+
+    def wrapper(state: ImagePipelineState) -> dict:
+        result = fn(state)
+        result["route"] = _route_after_quality_check(state, result)
+        return result
+
+    wrapper.__name__ = getattr(fn, "__name__", "quality_check")
+    return wrapper
+
+
+def _should_continue(state: ImagePipelineState) -> str:
+    """Conditional edge: follow the route the quality check recorded."""
+    route = state.get("route")
+    if route is not None:
+        return route
+    # Fallback for states that did not come through _with_route
+    return _route_after_quality_check(state, state)
+
+
 # ── Graph builder ───────────────────────────────────────────────────
 
 def build_workflow() -> StateGraph:
@@ -251,7 +503,7 @@ def build_workflow() -> StateGraph:
     graph = StateGraph(ImagePipelineState)
 
     # Register nodes (wrapped with Galileo instrumentation)
-    graph.add_node("quality_check", _observed("quality_check", quality_check_agent))
+    graph.add_node("quality_check", _observed("quality_check", _with_route(quality_check_agent)))
     graph.add_node("enhance", _observed("enhance", enhancement_agent))
     graph.add_node("generate_video", _observed("generate_video", video_generation_agent))
 
@@ -270,7 +522,45 @@ def build_workflow() -> StateGraph:
     graph.add_edge("enhance", "quality_check")
     graph.add_edge("generate_video", END)
 
-    return graph.compile()
+    # No human-in-the-loop and no resumption: spell out that there is no
+    # checkpointer or interrupt, so no per-step snapshots are taken
+    return graph.compile(checkpointer=None, interrupt_before=None, interrupt_after=None, debug=False)
+
+
+# The topology never changes between runs, so compile it once per process.
+# Nodes keep no per-run state (steps go to thread-local buffers), which
+# makes the shared app safe to invoke from several threads.
+_compiled_app: Optional[Any] = None
+_app_lock = threading.Lock()
+
+
+def _get_app():
+    """Return the process-wide compiled workflow, building it on first use."""
+    global _compiled_app  # noqa: PLW0603
+    if _compiled_app is None:
+        with _app_lock:
+            if _compiled_app is None:
+                _compiled_app = build_workflow()
+    return _compiled_app
+
+
+def reset_app() -> None:
+    """Drop the cached compiled workflow; the next run rebuilds it."""
+    global _compiled_app  # noqa: PLW0603
+    with _app_lock:
+        _compiled_app = None
+
+
+def _recursion_limit(state: ImagePipelineState) -> int:
+    """Superstep budget for one run.
+
+    Each enhancement iteration is two steps (enhance + quality_check), plus
+    the initial check and video generation.  Deriving the limit keeps large
+    max_iterations values under LangGraph's default of 25 from failing.
+    Negative values are clamped to zero, where the limit is exactly the
+    minimum a run needs.
+    """
+    return 2 * max(state.get("max_iterations", 5), 0) + 4
 
 
 def run_pipeline(
@@ -279,13 +569,14 @@ def run_pipeline(
     defer_upload: bool = False,
     raise_on_error: bool = True,
 ) -> ImagePipelineState:
-    """Build the graph, run it, and handle Galileo workflow lifecycle.
+    """Run the shared compiled graph and handle the Galileo workflow lifecycle.
 
     Args:
         initial_state: The initial pipeline state dict.
-        defer_upload: If True, replay steps into Galileo but do NOT upload
-                      yet.  Call ``flush_galileo()`` later to push all
-                      accumulated workflows in one batch.
+        defer_upload: If True, return as soon as the workflow is queued
+                      for the background uploader.  Call ``flush_galileo()``
+                      later to wait for all queued uploads.  If False, wait
+                      for this workflow's upload before returning.
         raise_on_error: If False, catch pipeline exceptions and return the
                         last known state (useful for anomaly testing).
 
@@ -294,40 +585,81 @@ def run_pipeline(
     """
     # Clear any leftover step buffer for this thread
     _get_step_buffer().clear()
+    _get_node_calls().clear()
 
-    app = build_workflow()
+    app = _get_app()
 
-    input_summary = json.dumps(
-        {k: v for k, v in initial_state.items() if k != "enhancement_log"},
-        default=str,
-    )
+    input_summary = _summarize(initial_state) if _INSTRUMENTATION_ENABLED else ""
 
     pipeline_error: Optional[Exception] = None
-    pipeline_start = time.time_ns()
+    pipeline_start = time.perf_counter_ns()
     try:
-        final_state = app.invoke(initial_state)
+        final_state = app.invoke(initial_state, config={"recursion_limit": _recursion_limit(initial_state)})
     except Exception as exc:
         pipeline_error = exc
         final_state = dict(initial_state)
         final_state["status"] = f"PIPELINE_ERROR: {type(exc).__name__}: {exc}"
-    pipeline_duration = time.time_ns() - pipeline_start
+    pipeline_duration = time.perf_counter_ns() - pipeline_start
+
+    if _INSTRUMENTATION_ENABLED:
+        # Queue the finished workflow for the background uploader
+        wf_status = 500 if pipeline_error else 200
+        _enqueue_workflow_for_replay(
+            input_summary, _summarize(final_state), pipeline_duration,
+            workflow_status_code=wf_status,
+        )
+        if not defer_upload:
+            flush_galileo()
+    else:
+        _init_galileo()  # logs once why observability is off
+
+    if pipeline_error and raise_on_error:
+        raise pipeline_error
+
+    return final_state
 
-    output_summary = json.dumps(
-        {k: v for k, v in final_state.items() if k != "enhancement_log"},
-        default=str,
-    )
 
-    # Replay the entire workflow into Galileo atomically
-    wf_status = 500 if pipeline_error else 200
-    _replay_workflow_to_galileo(
-        input_summary, output_summary, pipeline_duration,
-        workflow_status_code=wf_status,
+async def arun_pipeline(
+    initial_state: ImagePipelineState,
+    *,
+    defer_upload: bool = False,
+    raise_on_error: bool = True,
+) -> ImagePipelineState:
+    """Async counterpart of :func:`run_pipeline`.
+
+    The nodes are CPU-bound NumPy/Pillow/ffmpeg work, so rather than
+    async node wrappers the whole run goes to a worker thread; the event
+    loop stays free, and step collection keeps its thread-local buffer.
+    """
+    return await asyncio.to_thread(
+        run_pipeline,
+        initial_state,
+        defer_upload=defer_upload,
+        raise_on_error=raise_on_error,
     )
 
-    if not defer_upload:
-        flush_galileo()
 
-    if pipeline_error and raise_on_error:
-        raise pipeline_error
+async def run_pipeline_batch(
+    states: list[ImagePipelineState],
+    *,
+    max_concurrency: int = 8,
+    defer_upload: bool = False,
+    raise_on_error: bool = True,
+) -> list[ImagePipelineState]:
+    """Run several pipelines concurrently; results come back in input order.
 
-    return final_state
+    At most *max_concurrency* runs are in flight at once.  Workflows are
+    queued for the background uploader as each run finishes; unless
+    *defer_upload* is set, the call waits for all of them to be uploaded
+    before returning.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(state: ImagePipelineState) -> ImagePipelineState:
+        async with sem:
+            return await arun_pipeline(state, defer_upload=True, raise_on_error=raise_on_error)
+
+    results = await asyncio.gather(*(_one(s) for s in states))
+    if not defer_upload:
+        await asyncio.to_thread(flush_galileo)
+    return list(results)
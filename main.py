@@ -10,20 +10,27 @@ Entry point that:
 
 Usage:
     python main.py <path/to/image.jpg> [--max-iterations 5]
+    python main.py --server < paths.txt   # one image path per line
 """
 
 from __future__ import annotations
 
 import argparse
+import logging
 import os
 import sys
-import json
 
-from dotenv import load_dotenv
 
+def _create_sample_image(path: str, *, force: bool = False) -> str:
+    """Generate a simple low-quality test image if none is provided.
+
+    The image is deterministic, so an existing file is reused unless
+    *force* is set.
+    """
+    if not force and os.path.isfile(path):
+        print(f"📷 Reusing sample test image: {path}")
+        return path
 
-def _create_sample_image(path: str) -> str:
-    """Generate a simple low-quality test image if none is provided."""
     from PIL import Image, ImageDraw, ImageFont
 
     img = Image.new("RGB", (640, 480), color=(60, 60, 60))  # dark, low contrast
@@ -45,10 +52,68 @@ def _create_sample_image(path: str) -> str:
     return path
 
 
-def main() -> None:
-    # ── Load environment ────────────────────────────────────────────
-    load_dotenv()
+def _initial_state(image_path: str, max_iterations: int) -> dict:
+    return {
+        "image_path": image_path,
+        "original_image_path": image_path,
+        "quality_scores": {},
+        "quality_passed": False,
+        "enhancement_iteration": 0,
+        "max_iterations": max_iterations,
+        "enhancement_log": [],
+        "video_output_path": "",
+        "status": "Starting pipeline",
+    }
+
+
+def _print_summary(final_state: dict) -> None:
+    print("\n" + "=" * 60)
+    print("  Pipeline Complete!")
+    print("=" * 60)
+    print(f"  Quality passed : {final_state.get('quality_passed')}")
+    print(f"  Iterations     : {final_state.get('enhancement_iteration')}")
+    print(f"  Final image    : {final_state.get('image_path')}")
+    print(f"  Video output   : {final_state.get('video_output_path')}")
+    print(f"  Status         : {final_state.get('status')}")
+
+    if final_state.get("enhancement_log"):
+        print("\n  Enhancement History:")
+        for entry in final_state["enhancement_log"]:
+            print(f"    Iter {entry['iteration']}: {', '.join(entry['applied'])}")
+
+    print("=" * 60 + "\n")
+
+
+def _serve(max_iterations: int) -> None:
+    """Process image paths read from stdin, one per line, until EOF.
+
+    One long-lived process keeps the compiled graph, the decode cache and
+    the Galileo client (and its HTTP connections) warm across images.
+    """
+    from graph.workflow import flush_galileo, run_pipeline  # late import after dotenv
+
+    print("🟢 Server mode: enter one image path per line (Ctrl-D to stop).")
+    for line in sys.stdin:
+        path = line.strip()
+        if not path:
+            continue
+        image_path = os.path.abspath(path)
+        if not os.path.isfile(image_path):
+            print(f"❌ Image not found: {image_path}")
+            continue
+
+        # A failing image must not take the server down
+        final_state = run_pipeline(
+            _initial_state(image_path, max_iterations),
+            defer_upload=True,
+            raise_on_error=False,
+        )
+        _print_summary(final_state)
 
+    flush_galileo()
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(
         description="Run the multi-agent image enhancement pipeline."
     )
@@ -64,12 +129,37 @@ def main() -> None:
         default=5,
         help="Maximum enhancement iterations (default: 5).",
     )
+    parser.add_argument(
+        "--force-sample",
+        action="store_true",
+        help="Regenerate the sample image even if it already exists.",
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Keep running and process image paths read from stdin, one per line.",
+    )
     args = parser.parse_args()
 
+    # ── Load environment ────────────────────────────────────────────
+    # Imported late so --help and argument errors skip it
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    # Pipeline diagnostics go to stdout, in order with the agents' prints;
+    # the root logger stays at WARNING so library INFO lines stay hidden
+    pipeline_log = logging.getLogger("pipeline")
+    pipeline_log.addHandler(logging.StreamHandler(sys.stdout))
+    pipeline_log.propagate = False
+
+    if args.server:
+        _serve(args.max_iterations)
+        return
+
     # Resolve image path
     if args.image is None:
         image_path = os.path.join(os.path.dirname(__file__) or ".", "sample_input.jpg")
-        _create_sample_image(image_path)
+        _create_sample_image(image_path, force=args.force_sample)
     else:
         image_path = os.path.abspath(args.image)
         if not os.path.isfile(image_path):
@@ -77,19 +167,7 @@ def main() -> None:
             sys.exit(1)
 
     # ── Build and run the workflow ──────────────────────────────────
-    from graph.workflow import run_pipeline  # late import after dotenv
-
-    initial_state = {
-        "image_path": image_path,
-        "original_image_path": image_path,
-        "quality_scores": {},
-        "quality_passed": False,
-        "enhancement_iteration": 0,
-        "max_iterations": args.max_iterations,
-        "enhancement_log": [],
-        "video_output_path": "",
-        "status": "Starting pipeline",
-    }
+    from graph.workflow import flush_galileo, run_pipeline  # late import after dotenv
 
     print("\n" + "=" * 60)
     print("  Multi-Agent Image Enhancement Pipeline")
@@ -98,26 +176,14 @@ def main() -> None:
     print(f"  Max iterations : {args.max_iterations}")
     print("=" * 60)
 
-    final_state = run_pipeline(initial_state)
+    # Galileo uploads run in the background; wait for them after the summary
+    final_state = run_pipeline(_initial_state(image_path, args.max_iterations), defer_upload=True)
 
     # ── Summary ─────────────────────────────────────────────────────
-    print("\n" + "=" * 60)
-    print("  Pipeline Complete!")
-    print("=" * 60)
-    print(f"  Quality passed : {final_state.get('quality_passed')}")
-    print(f"  Iterations     : {final_state.get('enhancement_iteration')}")
-    print(f"  Final image    : {final_state.get('image_path')}")
-    print(f"  Video output   : {final_state.get('video_output_path')}")
-    print(f"  Status         : {final_state.get('status')}")
+    _print_summary(final_state)
 
-    if final_state.get("enhancement_log"):
-        print("\n  Enhancement History:")
-        for entry in final_state["enhancement_log"]:
-            print(f"    Iter {entry['iteration']}: {', '.join(entry['applied'])}")
-
-    print("=" * 60 + "\n")
+    flush_galileo()
 
 
 if __name__ == "__main__":
     main()
-